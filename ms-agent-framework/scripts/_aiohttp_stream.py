@@ -0,0 +1,93 @@
+"""
+Direct aiohttp streaming transport for Azure OpenAI chat completions
+
+DirectChatAgent posts straight to the Azure OpenAI chat completions REST
+endpoint over the shared aiohttp session and parses the server-sent
+events itself, skipping the OpenAI SDK's httpx client on the hot
+streaming path. It exposes the small part of the agent interface the
+conversation loop uses (run_stream and tools), so it can stand in for an
+agent created with client.create_agent.
+
+Limitations: it keeps its own message history and does not support tool
+calling, so the agent's tools are unavailable while it is in use.
+
+Environment Variables Required:
+    AZURE_OPENAI_ENDPOINT - Your Azure OpenAI endpoint
+    AZURE_OPENAI_DEPLOYMENT_NAME - Your model deployment name
+
+Optional Environment Variables:
+    AZURE_OPENAI_API_VERSION - Azure OpenAI API version (default: 2024-10-21)
+
+Authentication:
+    Uses the shared, pre-warmed credential from _credential.py
+"""
+
+import asyncio
+import json
+import os
+from typing import NamedTuple
+from _http_session import get_session
+
+
+class TextChunk(NamedTuple):
+    """A piece of streamed response text."""
+    text: str
+
+
+class DirectChatAgent:
+    """Minimal streaming chat agent that talks to Azure OpenAI over aiohttp."""
+
+    tools = ()
+
+    def __init__(self, instructions: str):
+        """Start a conversation with the given system instructions.
+
+        Args:
+            instructions: The system prompt for the conversation
+        """
+        endpoint = os.environ["AZURE_OPENAI_ENDPOINT"].rstrip("/")
+        deployment = os.environ["AZURE_OPENAI_DEPLOYMENT_NAME"]
+        api_version = os.environ.get("AZURE_OPENAI_API_VERSION", "2024-10-21")
+        self.url = f"{endpoint}/openai/deployments/{deployment}/chat/completions?api-version={api_version}"
+        self.messages = [{"role": "system", "content": instructions}]
+
+        from _credential import COGNITIVE_SERVICES_SCOPE, credential
+        self._credential = credential
+        self._scope = COGNITIVE_SERVICES_SCOPE
+
+    async def run_stream(self, message: str):
+        """Send a message and stream the reply.
+
+        Args:
+            message: The user message
+
+        Yields:
+            TextChunk objects as the reply is generated
+        """
+        # A token refresh may shell out to 'az', so keep it off the event loop
+        token = (await asyncio.to_thread(self._credential.get_token, self._scope)).token
+        messages = self.messages + [{"role": "user", "content": message}]
+        reply_parts = []
+
+        session = await get_session()
+        async with session.post(
+            self.url,
+            json={"messages": messages, "stream": True},
+            headers={"Authorization": f"Bearer {token}"},
+        ) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                if not line.startswith(b"data: "):
+                    continue
+                data = line[len(b"data: "):].strip()
+                if data == b"[DONE]":
+                    break
+                # Events without choices (e.g. error payloads) carry no text
+                for choice in json.loads(data).get("choices", ()):
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        reply_parts.append(text)
+                        yield TextChunk(text)
+
+        # Only record the exchange once the reply has arrived in full
+        self.messages = messages + [{"role": "assistant", "content": "".join(reply_parts)}]
@@ -0,0 +1,38 @@
+"""
+Shared Azure OpenAI chat client for the Microsoft Agent Framework templates
+
+The templates import get_client() instead of constructing their own
+AzureOpenAIChatClient, so every agent created in a process reuses one
+client - and with it one credential and one pooled HTTP connection to
+Azure OpenAI - rather than paying a fresh credential lookup and TLS
+handshake for each client.
+
+Environment Variables Required:
+    AZURE_OPENAI_ENDPOINT - Your Azure OpenAI endpoint
+    AZURE_OPENAI_DEPLOYMENT_NAME - Your model deployment name
+
+Authentication:
+    Uses the shared, pre-warmed credential from _credential.py
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Get the process-wide Azure OpenAI chat client.
+
+    The client is created on first call and returned as-is afterwards.
+    It owns the underlying OpenAI SDK client, whose HTTP connection pool
+    keeps connections alive between requests.
+
+    Returns:
+        The shared AzureOpenAIChatClient
+    """
+    # Imported here rather than at module level: agent_framework.azure and
+    # azure.identity take a while to load (and _credential fetches a token
+    # on import), so scripts start instantly until a client is needed
+    from agent_framework.azure import AzureOpenAIChatClient
+    from _credential import credential
+
+    return AzureOpenAIChatClient(credential=credential)
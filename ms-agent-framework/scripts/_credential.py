@@ -0,0 +1,98 @@
+"""
+Shared Azure credential for the Microsoft Agent Framework templates
+
+AzureCliCredential shells out to 'az account get-access-token' for every
+token it hands out, which costs a few hundred milliseconds each time.
+This module builds one credential per process, caches the tokens it
+returns until shortly before they expire, and requests the Azure
+OpenAI token at import so the first agent call does not wait on the CLI.
+
+Authentication:
+    Tries Azure CLI credentials first (run 'az login'), then falls back to
+    DefaultAzureCredential (environment, managed identity, ...)
+"""
+
+import time
+from azure.core.credentials import AccessTokenInfo
+from azure.identity import (
+    AzureCliCredential,
+    ChainedTokenCredential,
+    DefaultAzureCredential,
+)
+
+
+# Token scope for Azure OpenAI (Cognitive Services)
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+# Refresh cached tokens this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 300
+
+
+class CachedTokenCredential:
+    """Credential wrapper that reuses tokens until they are close to expiry."""
+
+    def __init__(self, credential):
+        self._credential = credential
+        self._tokens = {}
+
+    def get_token(self, *scopes, **kwargs):
+        """Get an access token, from the cache when it is still valid.
+
+        Args:
+            scopes: The token scopes to request
+            kwargs: Extra options passed to the wrapped credential; requests
+                with options (claims, tenant_id, ...) bypass the cache
+
+        Returns:
+            An azure.core.credentials.AccessToken
+        """
+        if kwargs:
+            return self._credential.get_token(*scopes, **kwargs)
+
+        token = self._tokens.get(scopes)
+        if token is None or token.expires_on - TOKEN_REFRESH_MARGIN <= time.time():
+            token = self._credential.get_token(*scopes)
+            self._tokens[scopes] = token
+        return token
+
+    def get_token_info(self, *scopes, options=None):
+        """Get an access token through the same cache as get_token.
+
+        azure-core's BearerTokenCredentialPolicy (used by
+        get_bearer_token_provider) prefers this method when it exists, so it
+        must not bypass the cache.
+
+        Args:
+            scopes: The token scopes to request
+            options: Extra token request options; requests with options
+                (claims, tenant_id, ...) bypass the cache
+
+        Returns:
+            An azure.core.credentials.AccessTokenInfo
+        """
+        if options:
+            if hasattr(self._credential, "get_token_info"):
+                return self._credential.get_token_info(*scopes, options=options)
+            token = self._credential.get_token(*scopes, **options)
+        else:
+            token = self.get_token(*scopes)
+        return AccessTokenInfo(token.token, token.expires_on)
+
+    def __getattr__(self, name):
+        # Delegate everything else (close, ...) unchanged
+        return getattr(self._credential, name)
+
+
+credential = CachedTokenCredential(
+    ChainedTokenCredential(
+        AzureCliCredential(),
+        DefaultAzureCredential()
+    )
+)
+
+# Prime the token cache now; if this fails (e.g. not logged in), the same
+# error is raised again on the first real token request
+try:
+    credential.get_token(COGNITIVE_SERVICES_SCOPE)
+except Exception:
+    pass
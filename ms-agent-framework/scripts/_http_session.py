@@ -0,0 +1,37 @@
+"""
+Shared aiohttp session for the Microsoft Agent Framework templates
+
+One process-wide ClientSession, so every request made over aiohttp (tool
+web fetches, the direct streaming transport) reuses the same pool of
+warm connections instead of opening a new session per call. It is
+created lazily on first use, since it must be created inside the running
+event loop, and closed once at the end of main().
+
+Installation:
+    pip install aiohttp
+"""
+
+
+_SESSION = None
+
+
+async def get_session():
+    """Get the shared HTTP session, creating it on first use.
+
+    Returns:
+        The process-wide aiohttp.ClientSession
+    """
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        import aiohttp
+
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300)
+        )
+    return _SESSION
+
+
+async def close_session():
+    """Close the shared HTTP session if it was opened."""
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
@@ -0,0 +1,130 @@
+"""
+Vector conversation memory for the Microsoft Agent Framework templates
+
+Stores each conversation exchange as an embedding in an in-memory Qdrant
+collection and retrieves only the exchanges most relevant to a new
+message. Seeding a fresh agent with those (plus the latest exchange)
+keeps the prompt size roughly constant however long the session runs,
+instead of replaying the whole thread on every turn.
+
+Environment Variables Required:
+    AZURE_OPENAI_ENDPOINT - Your Azure OpenAI endpoint
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME - Your embedding model deployment
+        name (e.g. 'text-embedding-3-small')
+
+Optional Environment Variables:
+    AZURE_OPENAI_API_VERSION - Azure OpenAI API version (default: 2024-10-21)
+
+Installation:
+    pip install qdrant-client openai
+"""
+
+import asyncio
+import os
+
+
+# Number of earlier exchanges retrieved for each new message
+DEFAULT_TOP_K = 3
+
+
+def azure_openai_embedder(deployment: str):
+    """Create an async embedding function backed by Azure OpenAI.
+
+    Args:
+        deployment: The embedding model deployment name
+
+    Returns:
+        A coroutine function embed(text) -> list[float]
+    """
+    client = None
+
+    def make_client():
+        from azure.identity import get_bearer_token_provider
+        from openai import AsyncAzureOpenAI
+        from _credential import COGNITIVE_SERVICES_SCOPE, credential
+
+        return AsyncAzureOpenAI(
+            azure_endpoint=os.environ["AZURE_OPENAI_ENDPOINT"],
+            azure_ad_token_provider=get_bearer_token_provider(credential, COGNITIVE_SERVICES_SCOPE),
+            api_version=os.environ.get("AZURE_OPENAI_API_VERSION", "2024-10-21"),
+        )
+
+    async def embed(text: str) -> list[float]:
+        nonlocal client
+        if client is None:
+            client = await asyncio.to_thread(make_client)
+        response = await client.embeddings.create(model=deployment, input=text)
+        return response.data[0].embedding
+
+    return embed
+
+
+class ConversationMemory:
+    """Embedding-based store of conversation exchanges."""
+
+    def __init__(self, embed, top_k: int = DEFAULT_TOP_K, collection: str = "conversation"):
+        """Create an empty memory.
+
+        Args:
+            embed: Coroutine function embed(text) -> list[float]
+            top_k: Number of relevant exchanges to retrieve per message
+            collection: Name of the Qdrant collection
+        """
+        from qdrant_client import QdrantClient
+
+        self._embed = embed
+        self._client = QdrantClient(":memory:")
+        self.top_k = top_k
+        self.collection = collection
+        self._count = 0
+        self._last_exchange = None
+
+    async def context_for(self, message: str) -> str:
+        """Build the context to seed an agent with for a new message.
+
+        Args:
+            message: The new user message
+
+        Returns:
+            The most relevant earlier exchanges followed by the latest one,
+            or an empty string when nothing has been stored yet
+        """
+        if self._count == 0:
+            return ""
+
+        hits = self._client.query_points(
+            collection_name=self.collection,
+            query=await self._embed(message),
+            limit=self.top_k,
+        ).points
+        exchanges = [hit.payload["text"] for hit in hits if hit.payload["text"] != self._last_exchange]
+        exchanges.append(self._last_exchange)
+        return "\n\n".join(exchanges)
+
+    async def add(self, exchange: str):
+        """Store a conversation exchange.
+
+        Args:
+            exchange: The user message and agent reply as one text
+        """
+        from qdrant_client.models import Distance, PointStruct, VectorParams
+
+        vector = await self._embed(exchange)
+        if self._count == 0:
+            self._client.create_collection(
+                collection_name=self.collection,
+                vectors_config=VectorParams(size=len(vector), distance=Distance.COSINE),
+            )
+        self._client.upsert(
+            collection_name=self.collection,
+            points=[PointStruct(id=self._count, vector=vector, payload={"text": exchange})],
+        )
+        self._count += 1
+        self._last_exchange = exchange
+
+    def clear(self):
+        """Forget all stored exchanges."""
+        if self._count:
+            self._client.delete_collection(collection_name=self.collection)
+        self._count = 0
+        self._last_exchange = None
@@ -0,0 +1,111 @@
+"""
+Semantic response cache for the Microsoft Agent Framework templates
+
+Stores (prompt embedding, response) pairs in memory and returns the stored
+response when a new prompt is close enough to one seen before, so repeated
+or reworded questions skip the round trip to Azure OpenAI.
+
+Prompts are embedded with a small local sentence-transformers model. When
+sentence-transformers is not installed the cache falls back to matching
+prompts exactly (ignoring case and whitespace).
+
+Note: a cached reply does not see the conversation so far or fresh tool
+results (e.g. the current time), and the cached turn is not added to the
+agent's thread. Only enable it where that trade-off is acceptable.
+
+Loading the model and embedding prompts both run in a worker thread, so
+the event loop keeps running while the model downloads or encodes.
+
+Installation (optional):
+    pip install sentence-transformers
+"""
+
+import asyncio
+from collections import OrderedDict
+
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Marks a model that has not been loaded yet (None means unavailable)
+_NOT_LOADED = object()
+
+
+class SemanticCache:
+    """In-memory cache of agent responses keyed by prompt similarity."""
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 256, model_name: str = DEFAULT_MODEL):
+        """Create an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cached prompt to match
+            max_entries: Number of responses kept before the oldest is dropped
+            model_name: sentence-transformers model used to embed prompts
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self._entries = OrderedDict()  # normalized prompt -> (embedding, response)
+        self._model = _NOT_LOADED
+
+    async def get(self, prompt: str) -> str | None:
+        """Look up a response for a prompt.
+
+        Args:
+            prompt: The user prompt
+
+        Returns:
+            The cached response of the most similar prompt, or None on a miss
+        """
+        key = _normalize(prompt)
+        if key in self._entries:
+            return self._entries[key][1]
+        if not self._entries:
+            return None
+
+        embedding = await self._embed(prompt)
+        if embedding is None:
+            return None
+        best_score, best_response = max(
+            (float(embedding @ cached), response)
+            for cached, response in self._entries.values()
+        )
+        return best_response if best_score >= self.threshold else None
+
+    async def put(self, prompt: str, response: str):
+        """Store the response to a prompt.
+
+        Args:
+            prompt: The user prompt
+            response: The agent's full response
+        """
+        embedding = await self._embed(prompt)
+        self._entries[_normalize(prompt)] = (embedding, response)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    async def _embed(self, text: str):
+        # Returns None when sentence-transformers is unavailable
+        if self._model is _NOT_LOADED:
+            self._model = await asyncio.to_thread(_load_model, self.model_name)
+        if self._model is None:
+            return None
+        # Unit-length embeddings, so cosine similarity is a dot product
+        return await asyncio.to_thread(self._model.encode, text, normalize_embeddings=True)
+
+
+def _load_model(model_name: str):
+    # Importing sentence-transformers and loading (possibly downloading)
+    # the model are both slow, so this runs in a worker thread
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    return SentenceTransformer(model_name)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
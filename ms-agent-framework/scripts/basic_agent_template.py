@@ -18,8 +18,24 @@ Authentication:
 
 import asyncio
 import os
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
+from _client_pool import get_client
+
+
+# Section separator for console output
+_SEP50 = "=" * 50
+
+
+async def stream_reply(agent, message: str):
+    """Print the agent's reply to a message as it is generated.
+    
+    Args:
+        agent: The agent to send the message to
+        message: The user message
+    """
+    print("Agent: ", end="", flush=True)
+    async for chunk in agent.run_stream(message):
+        print(chunk.text, end="", flush=True)
+    print()
 
 
 async def main():
@@ -36,11 +52,9 @@ async def main():
         print("Set it with: export AZURE_OPENAI_DEPLOYMENT_NAME='gpt-4o-mini'")
         return
     
-    # Create chat client with Azure CLI authentication
+    # Get the shared chat client (Azure CLI authentication)
     try:
-        client = AzureOpenAIChatClient(
-            credential=AzureCliCredential()
-        )
+        client = get_client()
         print("✓ Connected to Azure OpenAI")
     except Exception as e:
         print(f"Error connecting to Azure OpenAI: {e}")
@@ -59,28 +73,24 @@ Always be respectful and professional."""
     print("✓ Agent created")
     
     # Run a simple query
-    print("\n" + "="*50)
+    print("\n" + _SEP50)
     print("Testing agent with a simple query...")
-    print("="*50 + "\n")
+    print(_SEP50 + "\n")
     
-    result = await agent.run("Hello! What can you help me with?")
-    print(f"Agent: {result.text}")
+    await stream_reply(agent, "Hello! What can you help me with?")
     
     # Example of multi-turn conversation
-    print("\n" + "="*50)
+    print("\n" + _SEP50)
     print("Testing multi-turn conversation...")
-    print("="*50 + "\n")
-    
-    result1 = await agent.run("My name is Alice and I like programming.")
-    print(f"Agent: {result1.text}")
+    print(_SEP50 + "\n")
     
-    result2 = await agent.run("What's my name and what do I like?")
-    print(f"Agent: {result2.text}")
+    await stream_reply(agent, "My name is Alice and I like programming.")
+    await stream_reply(agent, "What's my name and what do I like?")
 
 
 if __name__ == "__main__":
     print("Microsoft Agent Framework - Basic Agent Template")
-    print("="*50)
+    print(_SEP50)
     
     try:
         asyncio.run(main())
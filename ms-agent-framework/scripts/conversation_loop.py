@@ -12,22 +12,69 @@ Environment Variables Required:
     AZURE_OPENAI_ENDPOINT - Your Azure OpenAI endpoint
     AZURE_OPENAI_DEPLOYMENT_NAME - Your model deployment name
 
+Optional Environment Variables:
+    AGENT_SEMANTIC_CACHE - Set to 1 to answer repeated or near-identical
+        questions from a local response cache (see _semcache.py)
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME - Set to an embedding deployment to
+        retrieve relevant earlier turns from a vector memory instead of
+        replaying the whole conversation (see _memory.py)
+    AGENT_FAST_TRANSPORT - Set to 1 to stream replies over a direct aiohttp
+        connection instead of the SDK client; tools are unavailable in this
+        mode and aiohttp must be installed (see _aiohttp_stream.py)
+
 Authentication:
     Uses Azure CLI credentials (run 'az login' first)
 
+Optional Dependencies:
+    uvloop - Used as the asyncio event loop when installed (pip install uvloop>=0.18)
+
 Commands:
     /help - Show available commands
     /clear - Clear conversation history
+    /compact - Summarize earlier turns to shrink the conversation context
     /tools - Show available tools
     /quit or /exit - Exit the conversation
 """
 
+import ast
 import asyncio
+import inspect
 import os
+import re
+import signal
 import sys
+import threading
+import time
 from datetime import datetime
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
+from functools import lru_cache
+from agent_framework.tools import tool
+from _client_pool import get_client
+from _http_session import close_session
+from _memory import ConversationMemory, azure_openai_embedder
+from _semcache import SemanticCache
+
+
+# Section separator for console output
+_SEP60 = "=" * 60
+
+
+# Seconds between stdout flushes while a reply is streaming
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Compact the conversation once its estimated size passes this many tokens
+CONTEXT_TOKEN_BUDGET = 3000
+
+# Compaction keeps recent messages up to this many tokens, well under the
+# budget, so it only has to run again after several more turns
+COMPACT_TARGET_TOKENS = CONTEXT_TOKEN_BUDGET // 2
+
+# Most recent messages (user or assistant) kept verbatim when compacting
+KEEP_RECENT_MESSAGES = 20
+
+SUMMARY_INSTRUCTIONS = """Summarize the conversation you are given in a few sentences.
+
+Keep names, facts, preferences, decisions and open questions.
+Leave out greetings and small talk."""
 
 
 # Optional: Define some useful tools for the agent
@@ -37,7 +84,18 @@ def get_current_datetime() -> str:
     Returns:
         Current date and time in a readable format
     """
-    return datetime.now().strftime("%A, %B %d, %Y at %I:%M %p")
+    return _format_datetime(int(time.time()))
+
+
+@lru_cache(maxsize=1)
+def _format_datetime(second: int) -> str:
+    # Keyed by whole second so repeated tool calls within a turn reuse
+    # the formatted string instead of calling strftime again
+    return datetime.fromtimestamp(second).strftime("%A, %B %d, %Y at %I:%M %p")
+
+
+# Characters a calculator expression may contain, compiled once at import
+_ALLOWED_EXPR_RE = re.compile(r"\A[0-9+\-*/(). ]+\Z")
 
 
 def calculate(expression: str) -> str:
@@ -51,70 +109,294 @@ def calculate(expression: str) -> str:
     """
     try:
         # Only allow safe mathematical operations
-        allowed_chars = set("0123456789+-*/(). ")
-        if not all(c in allowed_chars for c in expression):
+        if not _ALLOWED_EXPR_RE.match(expression):
             return "Error: Expression contains invalid characters"
         
-        result = eval(expression, {"__builtins__": {}}, {})
+        result = eval(_compile_expression(expression), {"__builtins__": {}}, {})
         return f"{expression} = {result}"
     except Exception as e:
         return f"Error calculating: {str(e)}"
 
 
+# AST node types a calculator expression may contain: numbers, parentheses
+# and the basic arithmetic operators (no names, calls or exponentiation)
+_SAFE_NODES = (
+    ast.Expression, ast.Constant, ast.BinOp, ast.UnaryOp,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.UAdd, ast.USub,
+)
+
+
+@lru_cache(maxsize=512)
+def _compile_expression(expression: str):
+    # Parse and validate once per distinct expression; repeated calls
+    # reuse the compiled code object
+    tree = ast.parse(expression.strip(), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _SAFE_NODES):
+            raise ValueError(f"unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError("only numbers are allowed")
+    return compile(tree, "<calculate>", "eval")
+
+
+# Wrap the tool functions once at import time, so the tool schemas are
+# built from their signatures and docstrings a single time and the same
+# tool objects are handed to every agent. The description is only the
+# docstring's summary line, since the parameters already come from the
+# signature and repeating the Args section would bloat every request
+TOOLS = [
+    tool(name=func.__name__, description=inspect.getdoc(func).splitlines()[0])(func)
+    for func in (get_current_datetime, calculate)
+]
+
+
+# Banner and help text, built once and written with a single call
+_WELCOME_BANNER = f"""
+{_SEP60}
+Microsoft Agent Framework - Interactive Conversation
+{_SEP60}
+
+Commands:
+  /help    - Show this help message
+  /clear   - Clear conversation history and start fresh
+  /compact - Summarize earlier turns to save context
+  /tools   - Show available tools
+  /quit    - Exit the conversation
+
+Type your message and press Enter to chat with the agent.
+{_SEP60}
+
+"""
+
+_HELP_TEXT = """
+Available commands:
+  /help    - Show this help message
+  /clear   - Clear conversation history
+  /compact - Summarize earlier turns to save context
+  /tools   - Show available tools
+  /quit    - Exit the conversation
+
+"""
+
+
+def read_line(prompt: str) -> asyncio.Future:
+    """Print a prompt and read one line from stdin without blocking the loop.
+    
+    The line is read in a daemon thread: unlike the default executor, it
+    does not keep the process alive at exit while still waiting on input.
+    
+    Args:
+        prompt: Text written before reading
+        
+    Returns:
+        A future resolving to the line read ("" at end of input)
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(line, error):
+        if not future.done():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(line)
+    
+    def read():
+        try:
+            line, error = sys.stdin.readline(), None
+        except Exception as e:
+            line, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, line, error)
+        except RuntimeError:
+            pass  # The loop has already closed
+    
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    threading.Thread(target=read, daemon=True).start()
+    return future
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text (about 4 characters per token)."""
+    return len(text) // 4
+
+
 class ConversationLoop:
     """Interactive conversation loop with an agent."""
     
-    def __init__(self, agent):
+    def __init__(self, agent, cache=None, make_agent=None, summarize=None, memory=None):
+        """Set up the conversation loop.
+        
+        Args:
+            agent: The agent to chat with, or None to create it with
+                make_agent when it is first needed
+            cache: Optional SemanticCache used to answer repeated questions
+            make_agent: Optional factory make_agent(context="") returning a
+                fresh agent seeded with earlier conversation context
+            summarize: Optional coroutine function summarize(text) -> str;
+                together with make_agent it enables /compact
+            memory: Optional ConversationMemory; together with make_agent
+                each turn runs on a fresh agent seeded with the relevant
+                earlier turns instead of the full conversation
+        """
         self.agent = agent
+        self.cache = cache
+        self._make_agent = make_agent
+        self._summarize = summarize
+        self.memory = memory
         self.conversation_count = 0
+        self.history = []
+        self.history_tokens = 0
+        self._reply_task = None
+        self._reply_interrupted = False
     
     def print_welcome(self):
         """Print welcome message and instructions."""
-        print("\n" + "="*60)
-        print("Microsoft Agent Framework - Interactive Conversation")
-        print("="*60)
-        print("\nCommands:")
-        print("  /help  - Show this help message")
-        print("  /clear - Clear conversation history and start fresh")
-        print("  /tools - Show available tools")
-        print("  /quit  - Exit the conversation")
-        print("\nType your message and press Enter to chat with the agent.")
-        print("="*60 + "\n")
+        sys.stdout.write(_WELCOME_BANNER)
     
     def print_help(self):
         """Print help message."""
-        print("\nAvailable commands:")
-        print("  /help  - Show this help message")
-        print("  /clear - Clear conversation history")
-        print("  /tools - Show available tools")
-        print("  /quit  - Exit the conversation\n")
+        sys.stdout.write(_HELP_TEXT)
     
-    def show_tools(self):
+    async def get_agent(self):
+        """Get the current agent, creating it on first use.
+        
+        Creating the first agent also creates the shared client and fetches
+        a token, so it runs in a worker thread rather than on the event loop.
+        """
+        if self.agent is None:
+            self.agent = await asyncio.to_thread(self._make_agent)
+        return self.agent
+    
+    async def show_tools(self):
         """Display available tools."""
-        if not self.agent.tools:
+        agent = await self.get_agent()
+        if not agent.tools:
             print("\nNo tools available for this agent.\n")
             return
         
-        print(f"\nAvailable tools ({len(self.agent.tools)}):")
-        for tool in self.agent.tools:
-            print(f"  • {tool.name}: {tool.description}")
-        print()
+        tool_lines = "\n".join(f"  • {tool.name}: {tool.description}" for tool in agent.tools)
+        sys.stdout.write(f"\nAvailable tools ({len(agent.tools)}):\n{tool_lines}\n\n")
     
     async def clear_history(self):
         """Clear conversation history."""
-        # Create a new agent instance to reset the conversation
-        # Note: In production, you might want to explicitly clear the thread
+        # Drop the agent so the next turn creates a new one with an empty
+        # thread
+        if self._make_agent is not None:
+            self.agent = None
+        if self.cache is not None:
+            self.cache.clear()
+        if self.memory is not None:
+            self.memory.clear()
         print("\n[Conversation history cleared]\n")
         self.conversation_count = 0
+        self.history = []
+        self.history_tokens = 0
+    
+    def record_turn(self, role: str, text: str):
+        """Record a message so the conversation can be compacted later."""
+        message = f"{role}: {text}"
+        self.history.append(message)
+        self.history_tokens += estimate_tokens(message)
+    
+    async def compact_history(self):
+        """Summarize older turns and continue with a fresh, seeded agent.
+        
+        The most recent messages that fit in COMPACT_TARGET_TOKENS (at
+        most KEEP_RECENT_MESSAGES) are kept; everything older is replaced
+        by a short summary, and the agent is re-created with the summary
+        and recent messages as context.
+        """
+        if self._make_agent is None or self._summarize is None:
+            print("\n[Compaction is not available for this agent]\n")
+            return
+        if self.memory is not None:
+            # Each reply already starts from a fresh agent seeded from memory
+            print("\n[Compaction is not available with vector memory]\n")
+            return
+        
+        keep = 0
+        kept_tokens = 0
+        for message in reversed(self.history[-KEEP_RECENT_MESSAGES:]):
+            kept_tokens += estimate_tokens(message)
+            if kept_tokens > COMPACT_TARGET_TOKENS:
+                break
+            keep += 1
+        older = self.history[:len(self.history) - keep]
+        recent = self.history[len(self.history) - keep:]
+        if not older:
+            print("\n[Nothing to compact yet]\n")
+            return
+        
+        try:
+            summary = await self._summarize("\n".join(older))
+        except Exception as e:
+            print(f"\n[Error compacting conversation: {e}]\n")
+            return
+        
+        self.history = [f"Summary of earlier conversation: {summary}"] + recent
+        self.history_tokens = sum(estimate_tokens(message) for message in self.history)
+        self.agent = self._make_agent(context="\n".join(self.history))
+        print(f"\n[Compacted {len(older)} earlier messages into a summary]\n")
+    
+    def handle_interrupt(self):
+        """Handle Ctrl+C: stop a streaming reply, or remind how to exit."""
+        if self._reply_task is not None and not self._reply_task.done():
+            self._reply_interrupted = True
+            self._reply_task.cancel()
+        else:
+            sys.stdout.write("\n\nUse /quit to exit properly.\n\nYou: ")
+            sys.stdout.flush()
+    
+    async def stream_reply(self, agent, user_input: str) -> str:
+        """Stream the agent's reply to stdout and return the full text."""
+        # Writes are buffered and flushed on newlines or every
+        # STREAM_FLUSH_INTERVAL seconds rather than once per chunk
+        response_chunks = []
+        last_flush = time.monotonic()
+        async for chunk in agent.run_stream(user_input):
+            sys.stdout.write(chunk.text)
+            response_chunks.append(chunk.text)
+            now = time.monotonic()
+            if "\n" in chunk.text or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                sys.stdout.flush()
+                last_flush = now
+        print(flush=True)  # New line after streaming
+        return "".join(response_chunks)
     
     async def run(self):
         """Run the interactive conversation loop."""
+        # asyncio.run's own SIGINT handling would cancel the whole loop, so
+        # handle Ctrl+C here instead (not supported on Windows, where it
+        # raises KeyboardInterrupt as before)
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.handle_interrupt)
+        except (NotImplementedError, RuntimeError):
+            pass
+        
+        try:
+            await self.chat()
+        finally:
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+    
+    async def chat(self):
+        """Read messages and commands until the user quits."""
         self.print_welcome()
         
         while True:
             try:
-                # Get user input
-                user_input = input("You: ").strip()
+                # Read input off the event loop thread so it keeps servicing
+                # background I/O (token refresh, keepalives) while waiting
+                # on the prompt
+                line = await read_line("You: ")
+                if not line:
+                    raise EOFError
+                user_input = line.strip()
                 
                 # Handle empty input
                 if not user_input:
@@ -136,8 +418,12 @@ class ConversationLoop:
                         await self.clear_history()
                         continue
                     
+                    elif command == '/compact':
+                        await self.compact_history()
+                        continue
+                    
                     elif command == '/tools':
-                        self.show_tools()
+                        await self.show_tools()
                         continue
                     
                     else:
@@ -148,13 +434,42 @@ class ConversationLoop:
                 # Send message to agent
                 print("Agent: ", end="", flush=True)
                 
-                # Use streaming for better UX
-                full_response = ""
+                # Answer from the response cache when a similar question
+                # has already been asked
+                if self.cache is not None:
+                    cached_response = await self.cache.get(user_input)
+                    if cached_response is not None:
+                        print(cached_response, end="\n\n", flush=True)
+                        self.conversation_count += 1
+                        continue
+                
+                # Use streaming for better UX; the reply runs as a task so
+                # Ctrl+C can stop it without ending the session
                 try:
-                    async for chunk in self.agent.run_stream(user_input):
-                        print(chunk.text, end="", flush=True)
-                        full_response += chunk.text
-                    print()  # New line after streaming
+                    # With vector memory, answer on a fresh agent that only
+                    # sees the earlier turns relevant to this message
+                    if self.memory is not None and self._make_agent is not None:
+                        context = await self.memory.context_for(user_input)
+                        agent = await asyncio.to_thread(self._make_agent, context=context)
+                    else:
+                        agent = await self.get_agent()
+                    
+                    self._reply_task = asyncio.ensure_future(self.stream_reply(agent, user_input))
+                    try:
+                        full_response = await self._reply_task
+                    except asyncio.CancelledError:
+                        if not self._reply_interrupted:
+                            raise
+                        self._reply_interrupted = False
+                        print("\n\n[Reply interrupted]\n")
+                        continue
+                    finally:
+                        self._reply_task = None
+                    
+                    if self.cache is not None:
+                        await self.cache.put(user_input, full_response)
+                    if self.memory is not None:
+                        await self.memory.add(f"User: {user_input}\nAssistant: {full_response}")
                     
                 except Exception as e:
                     print(f"\n[Error: {e}]")
@@ -164,6 +479,13 @@ class ConversationLoop:
                 self.conversation_count += 1
                 print()  # Extra line for readability
                 
+                # Keep the context within budget by summarizing older turns
+                self.record_turn("User", user_input)
+                self.record_turn("Assistant", full_response)
+                if (self.history_tokens > CONTEXT_TOKEN_BUDGET
+                        and self._make_agent is not None and self.memory is None):
+                    await self.compact_history()
+                
             except KeyboardInterrupt:
                 print("\n\nUse /quit to exit properly.\n")
                 continue
@@ -187,41 +509,79 @@ async def main():
         print("Set it with: export AZURE_OPENAI_DEPLOYMENT_NAME='gpt-4o-mini'")
         return 1
     
-    # Create chat client
-    try:
-        client = AzureOpenAIChatClient(
-            credential=AzureCliCredential()
-        )
-    except Exception as e:
-        print(f"Error connecting to Azure OpenAI: {e}")
-        print("Make sure you've run 'az login' first")
-        return 1
-    
-    # Create agent with tools
-    agent = client.create_agent(
-        name="ChatBot",
-        instructions="""You are a helpful, friendly assistant.
+    instructions = """You are a helpful, friendly assistant.
 
 Be conversational and engaging. Keep your responses concise but informative.
 Use your available tools when appropriate to help the user.
-Remember context from the conversation to provide relevant responses.""",
-        tools=[
-            get_current_datetime,
-            calculate
-        ]
-    )
+Remember context from the conversation to provide relevant responses."""
     
-    # Run conversation loop
-    conversation = ConversationLoop(agent)
-    await conversation.run()
+    # The direct transport is only imported when it is enabled
+    fast_transport = os.environ.get("AGENT_FAST_TRANSPORT") == "1"
+    if fast_transport:
+        from _aiohttp_stream import DirectChatAgent
+    
+    def make_agent(context: str = ""):
+        """Create the chat agent, optionally seeded with earlier context."""
+        agent_instructions = instructions
+        if context:
+            agent_instructions += f"\n\nConversation so far:\n{context}"
+        if fast_transport:
+            return DirectChatAgent(agent_instructions)
+        return get_client().create_agent(
+            name="ChatBot",
+            instructions=agent_instructions,
+            tools=TOOLS
+        )
+    
+    async def summarize(text: str) -> str:
+        """Summarize conversation text with a fresh, tool-less agent."""
+        summarizer = get_client().create_agent(
+            name="Summarizer",
+            instructions=SUMMARY_INSTRUCTIONS
+        )
+        result = await summarizer.run(text)
+        return result.text
+    
+    # Optionally answer repeated questions from a local cache
+    cache = SemanticCache() if os.environ.get("AGENT_SEMANTIC_CACHE") == "1" else None
+    
+    # Optionally retrieve relevant earlier turns from a vector memory
+    memory = None
+    embedding_deployment = os.environ.get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME")
+    if embedding_deployment:
+        memory = ConversationMemory(azure_openai_embedder(embedding_deployment))
+    
+    # Run conversation loop. The agent (and with it the shared client and
+    # its token fetch) is created on the first message, so the banner and
+    # commands like /quit do not wait on connecting to Azure OpenAI
+    conversation = ConversationLoop(
+        None,
+        cache=cache,
+        make_agent=make_agent,
+        summarize=summarize,
+        memory=memory
+    )
+    try:
+        await conversation.run()
+    finally:
+        await close_session()
     
     return 0
 
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed (uvloop.run
+    # replaces the deprecated uvloop.install)
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
     try:
-        exit_code = asyncio.run(main())
+        exit_code = run(main())
         sys.exit(exit_code)
+    except KeyboardInterrupt:
+        print("\n\nExecution cancelled by user")
     except Exception as e:
         print(f"\nFatal error: {e}")
         import traceback
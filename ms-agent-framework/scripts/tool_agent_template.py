@@ -12,15 +12,40 @@ Environment Variables Required:
     AZURE_OPENAI_ENDPOINT - Your Azure OpenAI endpoint
     AZURE_OPENAI_DEPLOYMENT_NAME - Your model deployment name
 
+Optional Environment Variables:
+    TOOL_AGENT_BATCH - Set to 1 to send all test queries in a single request
+
 Authentication:
     Uses Azure CLI credentials (run 'az login' first)
+
+Optional Dependencies:
+    aiohttp - Required by the async_fetch_data tool (pip install aiohttp)
+    uvloop - Used as the asyncio event loop when installed (pip install uvloop>=0.18)
 """
 
 import asyncio
+import inspect
 import os
+import time
 from datetime import datetime
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import AzureCliCredential
+from functools import lru_cache
+from agent_framework.tools import tool
+from _client_pool import get_client
+from _http_session import close_session, get_session
+
+
+# Section separator for console output
+_SEP50 = "=" * 50
+
+
+# Upper bound on concurrent agent.run calls, to stay within the deployment's
+# requests-per-minute quota
+MAX_CONCURRENT_REQUESTS = 10
+
+# Limits for async_fetch_data: total seconds per request, and the most
+# bytes of a response body passed back to the model
+FETCH_TIMEOUT = 10
+MAX_FETCH_BYTES = 8000
 
 
 # Define custom tools as Python functions
@@ -33,7 +58,14 @@ def get_current_time() -> str:
     Returns:
         The current time in a readable format
     """
-    return datetime.now().strftime("%I:%M %p")
+    return _format_time(int(time.time()))
+
+
+@lru_cache(maxsize=1)
+def _format_time(second: int) -> str:
+    # Keyed by whole second so repeated tool calls within a turn reuse
+    # the formatted string instead of calling strftime again
+    return datetime.fromtimestamp(second).strftime("%I:%M %p")
 
 
 def calculate_area(length: float, width: float) -> float:
@@ -65,6 +97,16 @@ def convert_temperature(celsius: float, to_fahrenheit: bool = True) -> float:
         return (celsius - 32) * 5/9
 
 
+# Mock search results, built once; search_mock fills in the query
+_MOCK_RESULTS = tuple(
+    {
+        "title": f"Result {i+1} for '{{q}}'",
+        "snippet": "This is a sample result for your search query."
+    }
+    for i in range(3)
+)
+
+
 def search_mock(query: str, max_results: int = 5) -> list[dict]:
     """Search for information (mock implementation).
     
@@ -77,30 +119,121 @@ def search_mock(query: str, max_results: int = 5) -> list[dict]:
     """
     # This is a mock implementation - replace with actual search API
     return [
-        {
-            "title": f"Result {i+1} for '{query}'",
-            "snippet": f"This is a sample result for your search query."
-        }
-        for i in range(min(max_results, 3))
+        {"title": result["title"].format(q=query), "snippet": result["snippet"]}
+        for result in _MOCK_RESULTS[:max(max_results, 0)]
     ]
 
 
 async def async_fetch_data(url: str) -> str:
-    """Fetch data from a URL (async mock implementation).
+    """Fetch data from a URL.
     
     Args:
         url: The URL to fetch
         
     Returns:
-        The fetched data as a string
+        The fetched data as a string (at most MAX_FETCH_BYTES of it)
     """
-    # This is a mock - replace with actual HTTP request using aiohttp
-    await asyncio.sleep(0.1)  # Simulate network delay
-    return f"Mock data from {url}"
+    # Only this tool needs aiohttp, so the others work without it installed
+    import aiohttp
+    
+    # Reuse the shared session rather than opening one per call
+    session = await get_session()
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT)) as response:
+        response.raise_for_status()
+        # Read only what will be returned, so a huge body is never
+        # downloaded in full or passed into the model's context
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(4096):
+            body += chunk
+            if len(body) >= MAX_FETCH_BYTES:
+                break
+        return body[:MAX_FETCH_BYTES].decode(response.charset or "utf-8", errors="replace")
+
+
+# Wrap the tool functions once at import time, so the tool schemas are
+# built from their signatures and docstrings a single time and the same
+# tool objects are handed to every agent. The description is only the
+# docstring's summary line, since the parameters already come from the
+# signature and repeating the Args section would bloat every request
+TOOLS = [
+    tool(name=func.__name__, description=inspect.getdoc(func).splitlines()[0])(func)
+    for func in (
+        get_current_time,
+        calculate_area,
+        convert_temperature,
+        search_mock,
+        async_fetch_data
+    )
+]
+
+
+async def run_concurrently(agent, queries: list[str], max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> list:
+    """Run independent queries against an agent concurrently.
+    
+    Args:
+        agent: The agent to run the queries with
+        queries: The user queries to send
+        max_concurrency: Maximum number of requests in flight at once
+        
+    Returns:
+        The agent results, in the same order as the queries; a query that
+        failed has its exception in place of a result
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_one(query: str):
+        async with semaphore:
+            return await agent.run(query)
+    
+    # One failed query should not discard the answers to the others
+    return await asyncio.gather(*(run_one(query) for query in queries), return_exceptions=True)
+
+
+def build_batched_prompt(queries: list[str]) -> str:
+    """Combine independent queries into a single numbered prompt.
+
+    Args:
+        queries: The user queries to combine
+
+    Returns:
+        One prompt asking the agent to answer each query separately
+    """
+    numbered = "\n".join(f"{i}. {query}" for i, query in enumerate(queries, 1))
+    return (
+        "Answer each numbered question separately, "
+        "using the same numbering in your reply:\n" + numbered
+    )
+
+
+def print_result(result):
+    """Print an agent result and the tools it called.
+
+    Args:
+        result: The result returned by agent.run, or the exception it raised
+    """
+    if isinstance(result, BaseException):
+        print(f"Error: {result}")
+        return
+    
+    print(f"Agent: {result.text}")
+
+    # Show which tools were called
+    if result.tool_calls:
+        print(f"\n  Tools called:")
+        for tool_call in result.tool_calls:
+            print(f"    - {tool_call.name}({tool_call.arguments})")
 
 
 async def main():
     """Create and run an agent with custom tools."""
+    try:
+        await run_agent()
+    finally:
+        await close_session()
+
+
+async def run_agent():
+    """Create an agent with custom tools and run the test queries."""
     
     # Verify environment variables
     if not os.environ.get("AZURE_OPENAI_ENDPOINT"):
@@ -111,19 +244,16 @@ async def main():
         print("Error: AZURE_OPENAI_DEPLOYMENT_NAME environment variable not set")
         return
     
-    # Create chat client
+    # Get the shared chat client
     try:
-        client = AzureOpenAIChatClient(
-            credential=AzureCliCredential()
-        )
+        client = get_client()
         print("✓ Connected to Azure OpenAI")
     except Exception as e:
         print(f"Error connecting to Azure OpenAI: {e}")
         print("Make sure you've run 'az login' first")
         return
     
-    # Create agent with tools
-    # The tools list can include any Python function
+    # Create agent with the precompiled tools
     agent = client.create_agent(
         name="ToolBot",
         instructions="""You are a helpful assistant with access to various tools.
@@ -136,13 +266,7 @@ Use your tools to help users with:
 - Fetching data from URLs
 
 Always use the appropriate tool when the user's request requires it.""",
-        tools=[
-            get_current_time,
-            calculate_area,
-            convert_temperature,
-            search_mock,
-            async_fetch_data
-        ]
+        tools=TOOLS
     )
     print("✓ Agent created with tools")
     print(f"  Available tools: {len(agent.tools)}")
@@ -156,28 +280,40 @@ Always use the appropriate tool when the user's request requires it.""",
         "Fetch data from https://example.com/api/data"
     ]
     
-    print("\n" + "="*50)
+    print("\n" + _SEP50)
     print("Testing agent with various queries...")
-    print("="*50)
+    print(_SEP50)
     
-    for query in test_queries:
+    if os.environ.get("TOOL_AGENT_BATCH") == "1":
+        # Ask all the questions in one request and let the model call
+        # the tools it needs for each of them
+        prompt = build_batched_prompt(test_queries)
+        print(f"\n\nUser: {prompt}")
+        print_result(await agent.run(prompt))
+        return
+
+    # The queries are independent, so send them concurrently and print
+    # the results in order once they are all back
+    results = await run_concurrently(agent, test_queries)
+
+    for query, result in zip(test_queries, results):
         print(f"\n\nUser: {query}")
-        result = await agent.run(query)
-        print(f"Agent: {result.text}")
-        
-        # Show which tools were called
-        if result.tool_calls:
-            print(f"\n  Tools called:")
-            for tool_call in result.tool_calls:
-                print(f"    - {tool_call.name}({tool_call.arguments})")
+        print_result(result)
 
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed (uvloop.run
+    # replaces the deprecated uvloop.install)
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
     print("Microsoft Agent Framework - Tool Agent Template")
-    print("="*50)
+    print(_SEP50)
     
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\n\nExecution cancelled by user")
     except Exception as e:
@@ -0,0 +1,25 @@
+"""Shared setup for the tests of the scripts/ templates.
+
+Puts scripts/ on sys.path and, when the Agent Framework SDK is not
+installed, stubs agent_framework.tools so the templates can be imported.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+try:
+    import agent_framework.tools  # noqa: F401
+except ImportError:
+    def tool(name=None, description=None):
+        """Stand-in for agent_framework.tools.tool that returns the function unchanged."""
+        return lambda func: func
+
+    tools = types.ModuleType("agent_framework.tools")
+    tools.tool = tool
+    package = types.ModuleType("agent_framework")
+    package.tools = tools
+    sys.modules["agent_framework"] = package
+    sys.modules["agent_framework.tools"] = tools
@@ -0,0 +1,103 @@
+"""Tests for the server-sent event parsing in scripts/_aiohttp_stream.py."""
+
+import asyncio
+import json
+import sys
+import types
+
+import pytest
+
+import _aiohttp_stream
+from _aiohttp_stream import DirectChatAgent
+
+
+def event(payload):
+    """Encode one server-sent event line."""
+    return b"data: " + json.dumps(payload).encode() + b"\n"
+
+
+def delta(text):
+    return event({"choices": [{"delta": {"content": text}}]})
+
+
+class FakeResponse:
+    def __init__(self, lines):
+        self.content = self._iterate(lines)
+
+    async def _iterate(self, lines):
+        for line in lines:
+            yield line
+
+    def raise_for_status(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Session that answers each post with the next scripted event stream."""
+
+    def __init__(self, *streams):
+        self.streams = list(streams)
+        self.posts = []
+
+    def post(self, url, json, headers):
+        self.posts.append(json)
+        return FakeResponse(self.streams.pop(0))
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    token = types.SimpleNamespace(token="token")
+    credential = types.ModuleType("_credential")
+    credential.COGNITIVE_SERVICES_SCOPE = "scope"
+    credential.credential = types.SimpleNamespace(get_token=lambda scope: token)
+    monkeypatch.setitem(sys.modules, "_credential", credential)
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+    monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini")
+    return DirectChatAgent("Be brief.")
+
+
+def use_session(monkeypatch, session):
+    async def get_session():
+        return session
+    monkeypatch.setattr(_aiohttp_stream, "get_session", get_session)
+
+
+def collect(agent, message):
+    async def run():
+        return [chunk.text async for chunk in agent.run_stream(message)]
+    return asyncio.run(run())
+
+
+def test_parses_text_deltas(agent, monkeypatch):
+    session = FakeSession([
+        b": keep-alive\n",
+        event({"choices": [{"delta": {"role": "assistant"}}]}),
+        delta("Hel"),
+        b"\n",
+        event({"choices": []}),
+        event({"error": {"message": "filtered"}}),
+        delta("lo"),
+        b"data: [DONE]\n",
+        delta("ignored"),
+    ])
+    use_session(monkeypatch, session)
+
+    assert collect(agent, "Hi") == ["Hel", "lo"]
+    assert session.posts[0]["stream"] is True
+    assert agent.messages[-1] == {"role": "assistant", "content": "Hello"}
+
+
+def test_later_requests_include_earlier_exchange(agent, monkeypatch):
+    session = FakeSession([delta("One"), b"data: [DONE]\n"], [delta("Two"), b"data: [DONE]\n"])
+    use_session(monkeypatch, session)
+
+    collect(agent, "First")
+    collect(agent, "Second")
+
+    assert [m["content"] for m in session.posts[1]["messages"]] == ["Be brief.", "First", "One", "Second"]
@@ -0,0 +1,93 @@
+"""Tests for scripts/conversation_loop.py."""
+
+import asyncio
+
+from conversation_loop import (
+    COMPACT_TARGET_TOKENS,
+    KEEP_RECENT_MESSAGES,
+    ConversationLoop,
+    calculate,
+    estimate_tokens,
+)
+
+
+def test_calculate_basic_expression():
+    assert calculate("2 + 2") == "2 + 2 = 4"
+
+
+def test_calculate_allows_surrounding_whitespace():
+    assert calculate(" 2 + 2") == " 2 + 2 = 4"
+    assert calculate("2 + 2 ") == "2 + 2  = 4"
+
+
+def test_calculate_rejects_invalid_characters():
+    assert calculate("abc") == "Error: Expression contains invalid characters"
+
+
+def test_calculate_rejects_exponentiation():
+    assert calculate("9**9**9").startswith("Error calculating")
+
+
+def make_loop(history, memory=None):
+    """Build a ConversationLoop with the given history and recording fakes."""
+    calls = {"summarize": [], "make_agent": []}
+
+    async def summarize(text):
+        calls["summarize"].append(text)
+        return "earlier summary"
+
+    def make_agent(context=""):
+        calls["make_agent"].append(context)
+        return object()
+
+    loop = ConversationLoop(None, make_agent=make_agent, summarize=summarize, memory=memory)
+    for message in history:
+        loop.record_turn("User", message)
+    return loop, calls
+
+
+def test_compact_keeps_recent_messages_within_target():
+    # Each recorded message is about a fifth of the target, so the last
+    # four fit and the fifth from the end does not
+    message = "x" * (COMPACT_TARGET_TOKENS // 5 * 4)
+    loop, calls = make_loop([f"{i}{message}" for i in range(10)])
+    history = list(loop.history)
+    assert sum(estimate_tokens(m) for m in history[-4:]) <= COMPACT_TARGET_TOKENS
+    assert sum(estimate_tokens(m) for m in history[-5:]) > COMPACT_TARGET_TOKENS
+
+    asyncio.run(loop.compact_history())
+
+    assert calls["summarize"] == ["\n".join(history[:6])]
+    assert loop.history == ["Summary of earlier conversation: earlier summary"] + history[6:]
+    assert loop.history_tokens == sum(estimate_tokens(m) for m in loop.history)
+    assert calls["make_agent"] == ["\n".join(loop.history)]
+    assert loop.agent is not None
+
+
+def test_compact_keeps_at_most_keep_recent_messages():
+    loop, calls = make_loop(["hi"] * (KEEP_RECENT_MESSAGES + 5))
+
+    asyncio.run(loop.compact_history())
+
+    assert len(calls["summarize"]) == 1
+    assert len(loop.history) == KEEP_RECENT_MESSAGES + 1
+
+
+def test_compact_does_nothing_when_everything_fits():
+    loop, calls = make_loop(["hi", "hello"])
+    history = list(loop.history)
+
+    asyncio.run(loop.compact_history())
+
+    assert calls["summarize"] == []
+    assert calls["make_agent"] == []
+    assert loop.history == history
+
+
+def test_compact_is_unavailable_with_memory():
+    loop, calls = make_loop(["x" * 8000] * 4, memory=object())
+
+    asyncio.run(loop.compact_history())
+
+    assert calls["summarize"] == []
+    assert calls["make_agent"] == []
@@ -0,0 +1,118 @@
+"""Tests for the token cache in scripts/_credential.py."""
+
+import importlib
+import sys
+import time
+import types
+from collections import namedtuple
+
+import pytest
+
+AccessToken = namedtuple("AccessToken", ["token", "expires_on"])
+
+
+class FakeCredential:
+    """Credential that hands out numbered tokens and records each request."""
+
+    def __init__(self, lifetime=3600):
+        self.lifetime = lifetime
+        self.requests = []
+
+    def get_token(self, *scopes, **kwargs):
+        self.requests.append((scopes, kwargs))
+        return AccessToken(f"token-{len(self.requests)}", int(time.time()) + self.lifetime)
+
+
+@pytest.fixture
+def credential_module(monkeypatch):
+    """Import _credential against stand-in Azure credentials."""
+    class Unavailable:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def get_token(self, *scopes, **kwargs):
+            raise RuntimeError("not logged in")
+
+    identity = types.ModuleType("azure.identity")
+    identity.AzureCliCredential = Unavailable
+    identity.ChainedTokenCredential = Unavailable
+    identity.DefaultAzureCredential = Unavailable
+    monkeypatch.setitem(sys.modules, "azure.identity", identity)
+
+    try:
+        import azure.core.credentials  # noqa: F401
+    except ImportError:
+        credentials = types.ModuleType("azure.core.credentials")
+        credentials.AccessTokenInfo = namedtuple("AccessTokenInfo", ["token", "expires_on"])
+        monkeypatch.setitem(sys.modules, "azure", types.ModuleType("azure"))
+        monkeypatch.setitem(sys.modules, "azure.core", types.ModuleType("azure.core"))
+        monkeypatch.setitem(sys.modules, "azure.core.credentials", credentials)
+
+    sys.modules.pop("_credential", None)
+    yield importlib.import_module("_credential")
+    sys.modules.pop("_credential", None)
+
+
+def test_get_token_is_cached(credential_module):
+    fake = FakeCredential()
+    credential = credential_module.CachedTokenCredential(fake)
+
+    first = credential.get_token("scope")
+    second = credential.get_token("scope")
+
+    assert first is second
+    assert len(fake.requests) == 1
+
+
+def test_get_token_is_cached_per_scope(credential_module):
+    fake = FakeCredential()
+    credential = credential_module.CachedTokenCredential(fake)
+
+    credential.get_token("scope-a")
+    credential.get_token("scope-b")
+
+    assert len(fake.requests) == 2
+
+
+def test_get_token_refreshes_near_expiry(credential_module):
+    fake = FakeCredential(lifetime=credential_module.TOKEN_REFRESH_MARGIN - 1)
+    credential = credential_module.CachedTokenCredential(fake)
+
+    first = credential.get_token("scope")
+    second = credential.get_token("scope")
+
+    assert first.token != second.token
+    assert len(fake.requests) == 2
+
+
+def test_get_token_with_options_bypasses_cache(credential_module):
+    fake = FakeCredential()
+    credential = credential_module.CachedTokenCredential(fake)
+
+    credential.get_token("scope")
+    credential.get_token("scope", claims="extra")
+
+    assert fake.requests[-1] == (("scope",), {"claims": "extra"})
+    assert len(fake.requests) == 2
+
+
+def test_get_token_info_uses_cache(credential_module):
+    fake = FakeCredential()
+    credential = credential_module.CachedTokenCredential(fake)
+
+    token = credential.get_token("scope")
+    info = credential.get_token_info("scope")
+
+    assert (info.token, info.expires_on) == (token.token, token.expires_on)
+    assert len(fake.requests) == 1
+
+
+def test_get_token_info_with_options_bypasses_cache(credential_module):
+    fake = FakeCredential()
+    credential = credential_module.CachedTokenCredential(fake)
+
+    credential.get_token("scope")
+    info = credential.get_token_info("scope", options={"tenant_id": "other"})
+
+    assert fake.requests[-1] == (("scope",), {"tenant_id": "other"})
+    assert info.token == "token-2"
@@ -0,0 +1,46 @@
+"""Tests for the exact-match fallback of scripts/_semcache.py."""
+
+import asyncio
+
+import pytest
+
+import _semcache
+from _semcache import SemanticCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    # Behave as if sentence-transformers were not installed
+    monkeypatch.setattr(_semcache, "_load_model", lambda model_name: None)
+    return SemanticCache(max_entries=2)
+
+
+def test_empty_cache_misses(cache):
+    assert asyncio.run(cache.get("hello")) is None
+
+
+def test_matches_prompt_ignoring_case_and_whitespace(cache):
+    asyncio.run(cache.put("What is  Python?", "A language"))
+
+    assert asyncio.run(cache.get("  what is python? ")) == "A language"
+
+
+def test_different_prompt_misses_without_model(cache):
+    asyncio.run(cache.put("What is Python?", "A language"))
+
+    assert asyncio.run(cache.get("Tell me about Python")) is None
+
+
+def test_oldest_entry_is_dropped(cache):
+    for i in range(3):
+        asyncio.run(cache.put(f"question {i}", f"answer {i}"))
+
+    assert asyncio.run(cache.get("question 0")) is None
+    assert asyncio.run(cache.get("question 2")) == "answer 2"
+
+
+def test_clear_drops_entries(cache):
+    asyncio.run(cache.put("hello", "hi"))
+    cache.clear()
+
+    assert asyncio.run(cache.get("hello")) is None